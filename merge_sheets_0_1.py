@@ -1,103 +1,627 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
 import os
+import csv
 import logging
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; protein statistics fall back to NumPy reductions
+    njit = None
+    prange = range
 
 logger = logging.getLogger(__name__)
 
+# Columns identifying a sample; every other column holds protein values
+KEY_COLUMNS = ['PatientID', 'Timepoint']
+
+# Local filesystem that memory-maps files, so Parquet/Feather reads skip the copy into heap buffers
+MMAP_FILESYSTEM = pafs.LocalFileSystem(use_mmap=True)
+
+# File extension written for each supported output format
+OUTPUT_EXTENSIONS = {'parquet': '.parquet', 'csv': '.csv'}
+
+# Bytes per block handed to each pyarrow CSV parser thread
+CSV_BLOCK_SIZE = 16 << 20
+
+# Schema metadata key recording which CSV file (size and mtime) a Parquet cache was built from
+CSV_CACHE_SOURCE_KEY = b'proteomics_csv_source'
+
+def _protein_cols(columns: Sequence[str]) -> pd.Index:
+    """
+    Get the protein columns (all columns except PatientID and Timepoint) in their original order
+    """
+    return pd.Index(columns).difference(KEY_COLUMNS, sort=False)
+
+def _infer_format(path: str) -> str:
+    """
+    Infer the table format of a file from its extension (defaults to CSV)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    if extension in ('.feather', '.arrow'):
+        return 'feather'
+    return 'csv'
+
+def _normalize_types(table: pa.Table) -> pa.Table:
+    """
+    Normalize column types that differ between writers of the same data
+    
+    All-empty columns (inferred as Arrow's null type) become float64, which Arrow
+    can join and pandas reads as NaN anyway. Key columns are left as read; the
+    merge aligns them with _align_key_types.
+    """
+    def normalize(field: pa.Field) -> pa.Field:
+        if pa.types.is_null(field.type):
+            return field.with_type(pa.float64())
+        return field
+    
+    schema = pa.schema([normalize(field) for field in table.schema])
+    return table if schema.equals(table.schema) else table.cast(schema)
+
+def _downcast_floats(table: pa.Table) -> pa.Table:
+    """
+    Downcast float64 protein columns to float32 to halve the bytes moved through
+    the join, the coalescing of overlapping columns and the saved output
+    """
+    schema = pa.schema([
+        field.with_type(pa.float32())
+        if pa.types.is_float64(field.type) and field.name not in KEY_COLUMNS else field
+        for field in table.schema
+    ])
+    return table if schema.equals(table.schema) else table.cast(schema)
+
+def _open_dataset(path: str, input_format: str) -> ds.Dataset:
+    """
+    Open a Parquet or Feather file as a memory-mapped Arrow dataset
+    """
+    return ds.dataset(os.path.abspath(path), format=input_format, filesystem=MMAP_FILESYSTEM)
+
+def _csv_column_types(path: str) -> dict:
+    """
+    Build explicit Arrow column types for a proteomics CSV from its header row
+    
+    PatientID and Timepoint are read as strings and every other column as float32,
+    so the parser never has to infer types or fall back to generic string columns.
+    """
+    with open(path, newline='') as f:
+        header = next(csv.reader(f), [])
+    return {name: pa.string() if name in KEY_COLUMNS else pa.float32() for name in header}
+
+def _csv_source_stamp(path: str) -> bytes:
+    """
+    Identify the current contents of a CSV file by its size and modification time
+    """
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}".encode()
+
+def _csv_cache_stamp(cache_path: str) -> Optional[bytes]:
+    """
+    Return the source stamp stored in a Parquet cache, or None if the file is not one of our caches
+    """
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+    except (OSError, pa.ArrowException):
+        return None
+    return metadata.get(CSV_CACHE_SOURCE_KEY)
+
+def _read_table(
+    path: str,
+    input_format: Optional[str] = None,
+    columns: Optional[List[str]] = None
+) -> pa.Table:
+    """
+    Read a proteomics table into Arrow memory without going through pandas
+    
+    CSV files are parsed once and cached as a Parquet file next to the original
+    (<name>.csv.parquet), so later loads read typed column buffers instead of
+    re-parsing text. The cache records the CSV's size and modification time and
+    is only used while they match. It is written by full reads only, and a file
+    at the cache path that the cache did not write is never overwritten.
+    
+    Args:
+        path: Path to the data file
+        input_format: 'parquet', 'feather' or 'csv' (inferred from the extension if None)
+        columns: Subset of columns to load (all columns if None)
+        
+    Returns:
+        Arrow table with the requested columns
+    """
+    input_format = input_format or _infer_format(path)
+    
+    if input_format in ('parquet', 'feather'):
+        return _normalize_types(_open_dataset(path, input_format).to_table(columns=columns))
+    if input_format != 'csv':
+        raise ValueError(f"Unsupported input format: {input_format}")
+    
+    # Reuse the Parquet cache of a CSV file if it was built from the current contents
+    cache_path = path + '.parquet'
+    source_stamp = _csv_source_stamp(path)
+    cache_writable = not os.path.exists(cache_path)
+    if not cache_writable:
+        cache_stamp = _csv_cache_stamp(cache_path)
+        if cache_stamp == source_stamp:
+            logger.info(f"Using cached Parquet copy {cache_path}")
+            table = _open_dataset(cache_path, 'parquet').to_table(columns=columns)
+            return _normalize_types(table.replace_schema_metadata(None))
+        # A stale cache of ours may be replaced; any other file is left alone
+        cache_writable = cache_stamp is not None
+    
+    # Parse the memory-mapped file in parallel blocks with pinned column types
+    read_options = pv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE)
+    convert_options = pv.ConvertOptions(
+        column_types=_csv_column_types(path),
+        include_columns=columns or []
+    )
+    with pa.memory_map(path) as source:
+        table = pv.read_csv(source, read_options=read_options, convert_options=convert_options)
+    
+    # Only a full read can be cached
+    if columns is None and not cache_writable:
+        logger.warning(f"Not caching Parquet copy of {path}: {cache_path} exists and is not a cache")
+    elif columns is None:
+        # Write next to the cache and move the file into place, so a failed or
+        # interrupted write never leaves a truncated file at the cache path
+        tmp_path = f"{cache_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        try:
+            cache_table = table.replace_schema_metadata({CSV_CACHE_SOURCE_KEY: source_stamp})
+            pq.write_table(cache_table, tmp_path, compression='zstd')
+            os.replace(tmp_path, cache_path)
+            logger.info(f"Cached Parquet copy of {path} at {cache_path}")
+        except OSError as e:
+            logger.warning(f"Could not cache Parquet copy of {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    return table
+
+def _count_duplicate_keys(table: pa.Table) -> int:
+    """
+    Count rows whose PatientID/Timepoint pair already occurs earlier in the table
+    """
+    return table.num_rows - table.group_by(KEY_COLUMNS).aggregate([]).num_rows
+
+def _align_key_types(left: pa.Table, right: pa.Table) -> Tuple[pa.Table, pa.Table]:
+    """
+    Cast the right table's key columns to the left table's key types where they differ
+    
+    Dictionary-encoded keys (as written by merge_proteomics_datasets) are decoded
+    first, since the join is much slower on them and _encode_keys re-encodes the
+    result anyway. Keys that already match (the usual case) are not copied.
+    """
+    def decode(table: pa.Table, key: str) -> pa.Table:
+        field = table.schema.field(key)
+        if not pa.types.is_dictionary(field.type):
+            return table
+        index = table.schema.get_field_index(key)
+        return table.set_column(index, key, table[key].cast(field.type.value_type))
+    
+    for key in KEY_COLUMNS:
+        left, right = decode(left, key), decode(right, key)
+        key_type = left.schema.field(key).type
+        if right.schema.field(key).type != key_type:
+            index = right.schema.get_field_index(key)
+            right = right.set_column(index, key, right[key].cast(key_type))
+    return left, right
+
+def _split_by_patient(table: pa.Table, patient_ids: pa.Array, bounds: np.ndarray) -> List[pa.Table]:
+    """
+    Copy the rows of a table into one table per bucket of patient_ids
+    
+    bounds holds the positions in patient_ids where each bucket after the first
+    starts. Each part gets its own buffers, so it can be freed on its own.
+    """
+    positions = pc.index_in(table['PatientID'], value_set=patient_ids).to_numpy()
+    buckets = np.searchsorted(bounds, positions, side='right')
+    order = np.argsort(buckets, kind='stable')
+    counts = np.bincount(buckets, minlength=len(bounds) + 1)
+    return [table.take(indices) for indices in np.split(order, np.cumsum(counts)[:-1])]
+
+def _iter_patient_partitions(
+    left: pa.Table,
+    right: pa.Table,
+    partitions: int
+) -> Iterator[Tuple[pa.Table, pa.Table]]:
+    """
+    Split two tables into matching partitions by PatientID
+    
+    All rows of a patient land in the same partition, so each partition can be
+    joined independently. With a single partition the tables are yielded as-is.
+    Otherwise each table is split up front and each partition is released once
+    yielded. Callers should drop their own references to the tables, so the
+    generator holds the only ones and frees the full tables after the split.
+    """
+    patient_ids = pc.unique(pa.chunked_array(
+        left['PatientID'].chunks + right['PatientID'].chunks,
+        type=left.schema.field('PatientID').type
+    ))
+    if partitions <= 1 or len(patient_ids) == 0:
+        # Hand the tables over without keeping a reference in this generator
+        pending = [(left, right)]
+        del left, right
+        yield pending.pop()
+        return
+    
+    buckets = np.array_split(np.arange(len(patient_ids)), min(partitions, len(patient_ids)))
+    bounds = np.cumsum([len(bucket) for bucket in buckets])[:-1]
+    # Split one table at a time, so only one of them is held twice
+    left_parts = _split_by_patient(left, patient_ids, bounds)
+    del left
+    right_parts = _split_by_patient(right, patient_ids, bounds)
+    del right
+    
+    left_parts.reverse()
+    right_parts.reverse()
+    while left_parts:
+        yield left_parts.pop(), right_parts.pop()
+
+def _coalesce_columns(original: pa.ChunkedArray, fallback: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    Fill nulls in a column with the values of another column
+    
+    When both columns share a type and one of them cannot contribute anything,
+    the other is returned as-is instead of allocating a coalesced copy.
+    """
+    if original.type == fallback.type:
+        if original.null_count == 0 or fallback.null_count == len(fallback):
+            return original
+        if original.null_count == len(original):
+            return fallback
+    return pc.coalesce(original, fallback)
+
+def _encode_keys(table: pa.Table) -> pa.Table:
+    """
+    Dictionary-encode PatientID and Timepoint, which become categoricals in pandas
+    """
+    for key in KEY_COLUMNS:
+        index = table.schema.get_field_index(key)
+        table = table.set_column(index, key, pc.dictionary_encode(table[key]))
+    return table
+
+def _open_table_writer(
+    path: str,
+    output_format: str,
+    schema: pa.Schema
+) -> Union[pq.ParquetWriter, pv.CSVWriter]:
+    """
+    Open a streaming writer for the merged table in the requested output format
+    """
+    if output_format == 'csv':
+        return pv.CSVWriter(path, schema)
+    return pq.ParquetWriter(path, schema, compression='zstd', use_dictionary=KEY_COLUMNS)
+
+def _compact_table(table: pa.Table) -> pa.Table:
+    """
+    Copy a table into right-sized buffers
+    
+    The join reserves about 128 KiB per column whatever the row count, so a small
+    partition's join output is mostly slack; the copy is sized to the actual rows.
+    """
+    return pa.table({
+        name: pa.concat_arrays(column.chunks or [pa.array([], type=column.type)])
+        for name, column in zip(table.column_names, table.columns)
+    })
+
+def _merge_tables(
+    left: pa.Table,
+    right: pa.Table,
+    overlapping_cols: pd.Index
+) -> Tuple[pa.Table, pd.DataFrame]:
+    """
+    Outer join two proteomics tables on PatientID and Timepoint
+    
+    Values in overlapping protein columns are taken from the left table and
+    missing ones are filled from the right table. The result has the left
+    table's columns followed by the right table's remaining protein columns.
+    
+    Args:
+        left: Table whose values take precedence (transformed data)
+        right: Table used to fill in missing values (COMBAT data)
+        overlapping_cols: Protein columns present in both tables
+        
+    Returns:
+        Merged table, and the non-null counts of each overlapping column in the
+        left table ('original'), right table ('combat') and merged table ('merged')
+    """
+    # Output columns: all left columns, then the right-only protein columns
+    right_only = _protein_cols(right.column_names).difference(left.column_names, sort=False)
+    column_order = left.column_names + right_only.tolist()
+    
+    # An overlapping column that one side has no values for (in this partition) is
+    # left out of that side before the join, instead of being joined as a '_combat'
+    # copy and dropped again. Only same-typed pairs are pruned, so every partition
+    # produces the same output types. Sets keep the membership tests below O(1).
+    left_empty = {
+        col for col in overlapping_cols
+        if left[col].null_count == left.num_rows and left[col].type == right[col].type
+    }
+    right_empty = {
+        col for col in overlapping_cols
+        if right[col].null_count == right.num_rows and left[col].type == right[col].type
+        and col not in left_empty
+    }
+    
+    # Table.drop_columns removes one column at a time; selecting the kept ones is linear
+    def without(table: pa.Table, dropped: set) -> pa.Table:
+        return table.select([name for name in table.column_names if name not in dropped])
+    
+    merged_table = without(left, left_empty).join(
+        without(right, right_empty),
+        keys=KEY_COLUMNS,
+        join_type='full outer',
+        right_suffix='_combat'  # Keep original names for transformed data, add suffix for COMBAT
+    )
+    
+    # Fill nulls in the remaining overlapping columns from their COMBAT counterparts in one projection
+    num_rows = merged_table.num_rows
+    combat_names = {
+        col: f"{col}_combat" for col in overlapping_cols.difference(left_empty | right_empty, sort=False)
+    }
+    def value_count(name: str, pruned: bool) -> int:
+        return 0 if pruned else num_rows - merged_table[name].null_count
+    
+    counts = pd.DataFrame({
+        'original': {col: value_count(col, col in left_empty) for col in overlapping_cols},
+        'combat': {col: value_count(combat_names.get(col, col), col in right_empty) for col in overlapping_cols}
+    }, index=overlapping_cols, dtype=int)
+    
+    coalesced = {
+        col: _coalesce_columns(merged_table[col], merged_table[name]) for col, name in combat_names.items()
+    }
+    merged_table = pa.table({name: coalesced.get(name, merged_table[name]) for name in column_order})
+    
+    counts['merged'] = [num_rows - merged_table[col].null_count for col in counts.index]
+    return merged_table, counts
+
 def merge_proteomics_datasets(
     transformed_data_path: str,
     combat_data_path: str,
     output_dir: str,
-    output_filename: str = "merged_proteomics_data.csv"
-) -> pd.DataFrame:
+    output_filename: str = "merged_proteomics_data.parquet",
+    input_format: Optional[str] = None,
+    output_format: str = "parquet",
+    as_table: bool = False,
+    partitions: int = 1
+) -> Union[pd.DataFrame, pa.Table]:
     """
     Merge the transformed proteomics data with additional data from the COMBAT dataset
     
     This function:
-    1. Loads both datasets
+    1. Loads both datasets (Parquet, Feather or CSV) as Arrow tables
     2. Ensures they have compatible PatientID and Timepoint formats
     3. Performs an outer join to preserve all proteins from both datasets
+       (protein values are stored as float32)
     4. Handles any duplicate column names across datasets
     5. Saves the merged dataset to disk
     
+    The join and the coalescing of duplicate columns run on Arrow's columnar
+    buffers; the result is only converted to pandas at the end. PatientID and
+    Timepoint are returned dictionary-encoded (categorical in pandas).
+    
     Args:
-        transformed_data_path: Path to the transformed data CSV file
-        combat_data_path: Path to the COMBAT dataset CSV file
+        transformed_data_path: Path to the transformed data file
+        combat_data_path: Path to the COMBAT dataset file
         output_dir: Directory to save the merged data
-        output_filename: Name of the output file
+        output_filename: Name of the output file (its extension is set to match output_format)
+        input_format: Format of both input files (inferred from the extensions if None)
+        output_format: 'parquet' (default, key columns dictionary-encoded) or 'csv'
+            for legacy consumers that need text output
+        as_table: Return the merged Arrow table instead of a DataFrame
+        partitions: Number of PatientID partitions to join one at a time; more
+            partitions lower the peak memory of the join on large datasets
         
     Returns:
-        Merged DataFrame containing all proteins from both datasets
+        Merged DataFrame (or Arrow table) containing all proteins from both datasets
     """
     logger.info("Starting merge of proteomics datasets")
     
+    if output_format not in OUTPUT_EXTENSIONS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    # Load the datasets
+    # Load the datasets concurrently (Arrow releases the GIL while reading and parsing).
+    # Each worker downcasts its own table, so the float64 copies never coexist.
     logger.info(f"Loading transformed data from {transformed_data_path}")
-    transformed_df = pd.read_csv(transformed_data_path)
-    
     logger.info(f"Loading COMBAT data from {combat_data_path}")
-    combat_df = pd.read_csv(combat_data_path)
+    def load(path: str) -> pa.Table:
+        return _downcast_floats(_read_table(path, input_format))
     
-    # Get column lists (excluding PatientID and Timepoint)
-    transformed_cols = [col for col in transformed_df.columns if col not in ['PatientID', 'Timepoint']]
-    combat_cols = [col for col in combat_df.columns if col not in ['PatientID', 'Timepoint']]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        transformed_table, combat_table = executor.map(load, [transformed_data_path, combat_data_path])
     
-    # Check for overlapping columns
-    overlapping_cols = set(transformed_cols).intersection(set(combat_cols))
+    # Files from different writers may store the keys as string, large_string or dictionary
+    transformed_table, combat_table = _align_key_types(transformed_table, combat_table)
+    
+    # Check for overlapping protein columns (excluding PatientID and Timepoint)
+    overlapping_cols = _protein_cols(transformed_table.column_names).intersection(combat_table.column_names)
     logger.info(f"Found {len(overlapping_cols)} overlapping protein columns")
     
-    # Merge datasets on PatientID and Timepoint
-    logger.info("Merging datasets on PatientID and Timepoint")
-    merged_df = pd.merge(
-        transformed_df, 
-        combat_df,
-        on=['PatientID', 'Timepoint'], 
-        how='outer',
-        suffixes=('', '_combat')  # Keep original names for transformed data, add suffix for COMBAT
-    )
+    # Validate the join keys before the join can multiply rows
+    transformed_dups = _count_duplicate_keys(transformed_table)
+    combat_dups = _count_duplicate_keys(combat_table)
+    if transformed_dups and combat_dups:
+        raise ValueError(f"Both datasets contain duplicate PatientID/Timepoint pairs "
+                         f"({transformed_dups} transformed, {combat_dups} COMBAT); "
+                         f"a many-to-many merge is not supported")
+    if transformed_dups or combat_dups:
+        relationship = 'many-to-one' if transformed_dups else 'one-to-many'
+        logger.warning(f"Found duplicate PatientID/Timepoint pairs "
+                       f"({transformed_dups} transformed, {combat_dups} COMBAT); "
+                       f"performing a {relationship} merge")
     
-    # Handle overlapping columns if needed
-    for col in overlapping_cols:
-        combat_col = f"{col}_combat"
-        if combat_col in merged_df.columns:
-            # Count non-NaN values in each column
-            original_count = merged_df[col].notna().sum()
-            combat_count = merged_df[combat_col].notna().sum()
-            
-            logger.info(f"Column '{col}' exists in both datasets. "
-                       f"Original has {original_count} values, COMBAT has {combat_count} values.")
-            
-            # Fill NaN values in the original column with values from COMBAT column
-            merged_df[col] = merged_df[col].fillna(merged_df[combat_col])
+    # Merge datasets on PatientID and Timepoint (rows are left in join order, not sorted),
+    # one partition of patients at a time so only one partition's join is held in memory
+    logger.info(f"Merging datasets on PatientID and Timepoint in {max(partitions, 1)} partition(s)")
+    output_name = os.path.splitext(output_filename)[0] + OUTPUT_EXTENSIONS[output_format]
+    output_path = os.path.join(output_dir, output_name)
+    partition_iter = _iter_patient_partitions(transformed_table, combat_table, partitions)
+    del transformed_table, combat_table
+    merged_parts = []
+    overlap_counts = None
+    writer = None
+    try:
+        for transformed_part, combat_part in partition_iter:
+            merged_part, part_counts = _merge_tables(transformed_part, combat_part, overlapping_cols)
+            del transformed_part, combat_part
+            if partitions > 1:
+                merged_part = _compact_table(merged_part)
+            merged_part = _encode_keys(merged_part)
             
-            # Drop the duplicate COMBAT column
-            merged_df.drop(columns=[combat_col], inplace=True)
+            # The output file is written one partition (Parquet row group) at a time
+            if writer is None:
+                writer = _open_table_writer(output_path, output_format, merged_part.schema)
+            writer.write_table(merged_part)
             
-            logger.info(f"Merged values for '{col}', now has {merged_df[col].notna().sum()} values")
+            merged_parts.append(merged_part)
+            overlap_counts = part_counts if overlap_counts is None else overlap_counts + part_counts
+    finally:
+        if writer is not None:
+            writer.close()
+    
+    # Share one dictionary per key column across all partitions
+    merged_table = pa.concat_tables(merged_parts).unify_dictionaries()
+    del merged_parts
+    
+    if len(overlapping_cols):
+        totals = overlap_counts.sum()
+        logger.info(f"Merged {len(overlapping_cols)} overlapping columns: original data has "
+                   f"{totals['original']} values, COMBAT has {totals['combat']} values, "
+                   f"{totals['merged'] - totals['original']} missing values were filled from COMBAT")
+        
+        # Per-column details come from the aligned counts; no further passes over the data
+        if logger.isEnabledFor(logging.DEBUG):
+            for col, original, combat, merged in overlap_counts.itertuples():
+                logger.debug(f"Column '{col}' exists in both datasets. Original has {original} values, "
+                             f"COMBAT has {combat} values, merged column has {merged} values")
     
     # Get statistics about the merged dataset
-    total_proteins = len([col for col in merged_df.columns if col not in ['PatientID', 'Timepoint']])
-    total_patients = merged_df['PatientID'].nunique()
-    total_timepoints = merged_df['Timepoint'].nunique()
+    total_proteins = len(_protein_cols(merged_table.column_names))
+    total_patients = pc.count(pc.unique(merged_table['PatientID'])).as_py()
+    total_timepoints = pc.count(pc.unique(merged_table['Timepoint'])).as_py()
     
     logger.info(f"Merged dataset contains {total_proteins} proteins, "
                f"{total_patients} unique patients, and {total_timepoints} timepoints")
     
-    # Save merged dataset
-    output_path = os.path.join(output_dir, output_filename)
-    merged_df.to_csv(output_path, index=False)
     logger.info(f"Saved merged dataset to {output_path}")
     
     print(f"Merged dataset created with {total_proteins} proteins")
     print(f"Dataset contains {total_patients} unique patients with {total_timepoints} timepoints")
     print(f"Saved to {output_path}")
     
-    return merged_df
+    # Convert to pandas only when the caller needs it
+    if as_table:
+        return merged_table
+    return merged_table.to_pandas(split_blocks=True, self_destruct=True)
+
+def _column_stats_kernel(arr: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Compute count, min, max, mean and sample std of every column in a single sweep
+    
+    NaN values are skipped. Mean and variance use Welford's online update with
+    float64 accumulators, so float32 input loses no precision in the sums.
+    """
+    n_rows, n_cols = arr.shape
+    counts = np.zeros(n_cols, dtype=np.int64)
+    mins = np.full(n_cols, np.nan)
+    maxs = np.full(n_cols, np.nan)
+    means = np.full(n_cols, np.nan)
+    stds = np.full(n_cols, np.nan)
+    
+    for j in prange(n_cols):
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        lo = np.inf
+        hi = -np.inf
+        for i in range(n_rows):
+            x = arr[i, j]
+            if np.isnan(x):
+                continue
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+            if x < lo:
+                lo = x
+            if x > hi:
+                hi = x
+        
+        counts[j] = count
+        if count > 0:
+            mins[j] = lo
+            maxs[j] = hi
+            means[j] = mean
+        if count > 1:
+            stds[j] = np.sqrt(m2 / (count - 1))
+    
+    return counts, mins, maxs, means, stds
+
+if njit is not None:
+    # fastmath without 'nnan'/'ninf', which would let LLVM drop the NaN checks
+    _column_stats_kernel = njit(
+        parallel=True, cache=True, fastmath={'nsz', 'arcp', 'contract', 'reassoc'}
+    )(_column_stats_kernel)
+
+def _column_stats(arr: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Compute count, min, max, mean and sample std of every column of a 2D array,
+    using the numba kernel when numba is installed
+    """
+    if njit is not None:
+        return _column_stats_kernel(arr)
+    
+    counts = np.count_nonzero(~np.isnan(arr), axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return (counts,
+                np.nanmin(arr, axis=0).astype(np.float64),
+                np.nanmax(arr, axis=0).astype(np.float64),
+                np.nanmean(arr, axis=0, dtype=np.float64),
+                np.nanstd(arr, axis=0, dtype=np.float64, ddof=1))
+
+def _table_column_stats(table: pa.Table) -> Tuple[np.ndarray, ...]:
+    """
+    Compute count, min, max, mean and sample std of every column of an Arrow table
+    with pyarrow.compute, without converting the table to pandas
+    """
+    def to_numpy(scalars: List[pa.Scalar]) -> np.ndarray:
+        # Null results (no values, or fewer than two for std) become NaN
+        values = pa.array([scalar.as_py() for scalar in scalars], type=pa.float64())
+        return values.to_numpy(zero_copy_only=False)
+    
+    min_max = [pc.min_max(column) for column in table.columns]
+    return (np.array([pc.count(column).as_py() for column in table.columns], dtype=np.int64),
+            to_numpy([result['min'] for result in min_max]),
+            to_numpy([result['max'] for result in min_max]),
+            to_numpy([pc.mean(column) for column in table.columns]),
+            to_numpy([pc.stddev(column, ddof=1) for column in table.columns]))
+
+def _dataset_column_names(path: str, input_format: Optional[str] = None) -> List[str]:
+    """
+    Read the column names of a data file without loading any data
+    """
+    input_format = input_format or _infer_format(path)
+    if input_format == 'csv':
+        return list(_csv_column_types(path))
+    return _open_dataset(path, input_format).schema.names
 
-def get_protein_summary(df: pd.DataFrame) -> pd.DataFrame:
+def get_protein_summary(
+    df: Union[pd.DataFrame, pa.Table, str],
+    proteins: Optional[List[str]] = None
+) -> pd.DataFrame:
     """
     Generate a summary of all proteins in the merged dataset
     
@@ -106,40 +630,51 @@ def get_protein_summary(df: pd.DataFrame) -> pd.DataFrame:
     2. Calculates basic statistics (min, max, mean, std) for each protein
     3. Creates a sorted summary dataframe with this information
     
+    When given a file path, only the protein columns are read from disk and the
+    statistics are computed on the Arrow table, without building a DataFrame.
+    
     Args:
-        df: Merged proteomics DataFrame
+        df: Merged proteomics DataFrame, Arrow table, or path to a merged data file
+        proteins: Proteins to summarize (all proteins if None)
         
     Returns:
         Summary DataFrame with protein statistics
     """
-    # Get protein columns (all columns except PatientID and Timepoint)
-    protein_cols = [col for col in df.columns if col not in ['PatientID', 'Timepoint']]
-    
-    # Calculate coverage for each protein
-    total_samples = len(df)
-    coverage = {protein: (df[protein].notna().sum() / total_samples) * 100 for protein in protein_cols}
-    
-    # Calculate basic statistics
-    summary_data = []
-    
-    for protein in protein_cols:
-        protein_data = df[protein].dropna()
-        if len(protein_data) > 0:
-            summary_data.append({
-                'Protein': protein,
-                'Coverage (%)': coverage[protein],
-                'Count': len(protein_data),
-                'Min': protein_data.min(),
-                'Max': protein_data.max(),
-                'Mean': protein_data.mean(),
-                'Std': protein_data.std()
-            })
+    if isinstance(df, pd.DataFrame):
+        # Get protein columns (all columns except PatientID and Timepoint)
+        protein_cols = pd.Index(proteins) if proteins else _protein_cols(df.columns)
+        protein_block = df[protein_cols]
+        total_samples = len(df)
+        
+        # Calculate basic statistics for all proteins in one pass over a column-major matrix
+        dtype = np.float32 if (protein_block.dtypes == np.float32).all() else np.float64
+        arr = protein_block.to_numpy(dtype=dtype, na_value=np.nan)
+        counts, mins, maxs, means, stds = _column_stats(np.asfortranarray(arr))
+    else:
+        # Project only the protein columns out of the table or file
+        if isinstance(df, pa.Table):
+            protein_cols = pd.Index(proteins) if proteins else _protein_cols(df.column_names)
+            table = df.select(protein_cols.tolist())
+        else:
+            protein_cols = pd.Index(proteins) if proteins else _protein_cols(_dataset_column_names(df))
+            table = _read_table(df, columns=protein_cols.tolist())
+        total_samples = table.num_rows
+        counts, mins, maxs, means, stds = _table_column_stats(table)
     
-    # Create summary dataframe
-    summary_df = pd.DataFrame(summary_data)
+    # Create summary dataframe (proteins without any values are left out)
+    has_values = counts > 0
+    summary_df = pd.DataFrame({
+        'Protein': protein_cols[has_values],
+        'Coverage (%)': counts[has_values] / total_samples * 100,
+        'Count': counts[has_values],
+        'Min': mins[has_values],
+        'Max': maxs[has_values],
+        'Mean': means[has_values],
+        'Std': stds[has_values]
+    })
 
-    # Sort by coverage (descending)
-    summary_df.sort_values('Coverage (%)', ascending=False, inplace=True)
+    # Sort by coverage (descending); ties keep the column order of the dataset
+    summary_df.sort_values('Coverage (%)', ascending=False, kind='stable', inplace=True)
     
     return summary_df
 
@@ -160,7 +695,7 @@ def save_protein_summary(summary_df: pd.DataFrame, output_dir: str, filename: st
     
     # Save summary
     output_path = os.path.join(output_dir, filename)
-    summary_df.to_csv(output_path, index=False)
+    pv.write_csv(pa.Table.from_pandas(summary_df, preserve_index=False), output_path)
     
     print(f"Protein summary saved to {output_path}")
     return output_path
@@ -0,0 +1,129 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from merge_sheets_0_1 import get_protein_summary, merge_proteomics_datasets
+
+KEYS = ['PatientID', 'Timepoint']
+
+
+def _reference_merge(transformed, combat):
+    # The pandas merge the Arrow join replaced: outer join, then fill each
+    # overlapping column's gaps from its COMBAT copy
+    merged = pd.merge(transformed, combat, on=KEYS, how='outer', suffixes=('', '_combat'))
+    for col in transformed.columns.difference(KEYS).intersection(combat.columns):
+        merged[col] = merged[col].fillna(merged.pop(f"{col}_combat"))
+    return merged
+
+
+def _sorted(df):
+    df = df.astype({key: str for key in KEYS}).astype({col: float for col in df.columns.difference(KEYS)})
+    return df.sort_values(KEYS).reset_index(drop=True)
+
+
+def _merge(tmp_path, transformed, combat, partitions, **kwargs):
+    transformed.to_parquet(tmp_path / "transformed.parquet", index=False)
+    combat.to_parquet(tmp_path / "combat.parquet", index=False)
+    return merge_proteomics_datasets(
+        str(tmp_path / "transformed.parquet"), str(tmp_path / "combat.parquet"),
+        str(tmp_path / f"merged_{partitions}"), partitions=partitions, **kwargs
+    )
+
+
+@pytest.mark.parametrize("partitions", [1, 2, 4])
+def test_merge_fills_gaps_from_combat(tmp_path, partitions):
+    nan = np.nan
+    transformed = pd.DataFrame({
+        'PatientID': ['p1', 'p2', 'p3'],
+        'Timepoint': ['day1', 'day1', 'day5'],
+        'A': [1.0, 2.0, 3.0],
+        'B': [10.0, nan, 30.0],   # overlapping, gap filled from COMBAT
+        'C': [nan, nan, nan],     # overlapping, empty in transformed
+        'F': [4.0, nan, 6.0],     # overlapping, empty in COMBAT
+    })
+    combat = pd.DataFrame({
+        'PatientID': ['p2', 'p3', 'p4'],
+        'Timepoint': ['day1', 'day5', 'day1'],
+        'B': [20.0, 99.0, 40.0],
+        'C': [7.0, nan, 8.0],
+        'F': [nan, nan, nan],
+        'D': [0.5, 0.25, 0.125],  # COMBAT only
+    })
+
+    merged = _merge(tmp_path, transformed, combat, partitions)
+
+    expected = pd.DataFrame({
+        'PatientID': ['p1', 'p2', 'p3', 'p4'],
+        'Timepoint': ['day1', 'day1', 'day5', 'day1'],
+        'A': [1.0, 2.0, 3.0, nan],
+        'B': [10.0, 20.0, 30.0, 40.0],
+        'C': [nan, 7.0, nan, 8.0],
+        'F': [4.0, nan, 6.0, nan],
+        'D': [nan, 0.5, 0.25, 0.125],
+    })
+    assert merged.columns.tolist() == expected.columns.tolist()
+    pd.testing.assert_frame_equal(_sorted(merged), expected)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_merge_matches_pandas_reference(tmp_path, seed):
+    rng = np.random.default_rng(seed)
+    keys = [(f"P{i:02d}", t) for i in range(20) for t in ('day1', 'day5')]
+
+    def dataset(proteins):
+        rows = np.sort(rng.choice(len(keys), 25, replace=False))
+        df = pd.DataFrame([keys[i] for i in rows], columns=KEYS)
+        for protein in proteins:
+            # Values are float32-exact; some columns are sparse or entirely empty
+            values = rng.normal(size=len(df)).astype(np.float32).astype(float)
+            values[rng.random(len(df)) < rng.choice([0, 0.5, 0.95, 1])] = np.nan
+            df[protein] = values
+        return df
+
+    transformed = dataset(['A', 'B', 'C'])
+    combat = dataset(['B', 'C', 'E'])
+    expected = _reference_merge(transformed, combat)
+
+    for partitions in (1, 4, 40):
+        merged = _merge(tmp_path, transformed, combat, partitions)
+        assert merged.columns.tolist() == expected.columns.tolist()
+        pd.testing.assert_frame_equal(_sorted(merged), _sorted(expected))
+
+
+def test_protein_summary_matches_across_inputs(tmp_path):
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(40, 6))
+    values[rng.random(values.shape) < 0.4] = np.nan
+    values[:, 5] = np.nan  # proteins without values are left out of the summary
+    df = pd.DataFrame(values, columns=[f"P{i}" for i in range(6)])
+    df.insert(0, 'PatientID', [f"C-{i // 2:03d}" for i in range(40)])
+    df.insert(1, 'Timepoint', ['day1', 'day5'] * 20)
+    combat = df[KEYS].assign(P9=rng.normal(size=40))
+
+    table = _merge(tmp_path, df, combat, 1, as_table=True)
+    path = str(tmp_path / "merged_1" / "merged_proteomics_data.parquet")
+
+    from_table = get_protein_summary(table).reset_index(drop=True)
+    from_frame = get_protein_summary(table.to_pandas()).reset_index(drop=True)
+    from_path = get_protein_summary(path).reset_index(drop=True)
+
+    proteins = table.to_pandas().drop(columns=KEYS + ['P5'])
+    stats = proteins.agg(['count', 'min', 'max', 'mean', 'std']).T
+    expected = pd.DataFrame({
+        'Protein': stats.index,
+        'Coverage (%)': stats['count'].to_numpy() / 40 * 100,
+        'Count': stats['count'].to_numpy(),
+        'Min': stats['min'].to_numpy(),
+        'Max': stats['max'].to_numpy(),
+        'Mean': stats['mean'].to_numpy(),
+        'Std': stats['std'].to_numpy(),
+    }).sort_values('Coverage (%)', ascending=False, kind='stable').reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(from_table, expected, check_dtype=False, rtol=1e-5)
+    pd.testing.assert_frame_equal(from_frame, from_table, check_dtype=False)
+    pd.testing.assert_frame_equal(from_path, from_table, check_dtype=False)
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run each merge in a fresh interpreter, so Arrow's peak allocation covers that merge only
+PEAK_SCRIPT = """
+import contextlib, io, sys
+sys.path.insert(0, {repo!r})
+import pyarrow as pa
+import merge_sheets_0_1
+with contextlib.redirect_stdout(io.StringIO()):
+    merge_sheets_0_1.merge_proteomics_datasets(
+        {transformed!r}, {combat!r}, {output_dir!r}, partitions={partitions}, as_table=True
+    )
+print(pa.default_memory_pool().max_memory())
+"""
+
+
+def _write_dataset(path, rows, proteins, seed):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'PatientID': [f"C-{i // 2:05d}" for i in rows],
+        'Timepoint': ['day1' if i % 2 == 0 else 'day5' for i in rows],
+    })
+    values = rng.normal(size=(len(rows), len(proteins))).astype(np.float32)
+    values[rng.random(values.shape) < 0.3] = np.nan
+    df = pd.concat([df, pd.DataFrame(values, columns=proteins)], axis=1)
+    df.to_parquet(path, index=False)
+
+
+def _peak_memory(tmp_path, partitions):
+    script = PEAK_SCRIPT.format(
+        repo=REPO_DIR,
+        transformed=str(tmp_path / "transformed.parquet"),
+        combat=str(tmp_path / "combat.parquet"),
+        output_dir=str(tmp_path / f"merged_{partitions}"),
+        partitions=partitions,
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return int(result.stdout.strip().splitlines()[-1])
+
+
+def test_peak_memory_falls_as_partitions_grow(tmp_path):
+    _write_dataset(tmp_path / "transformed.parquet", range(0, 24000),
+                   [f"P{i}" for i in range(200)], seed=1)
+    _write_dataset(tmp_path / "combat.parquet", range(6000, 30000),
+                   [f"P{i}" for i in range(100, 300)], seed=2)
+
+    peaks = [_peak_memory(tmp_path, partitions) for partitions in (1, 8, 32)]
+
+    assert peaks[1] < peaks[0]
+    assert peaks[2] <= peaks[1] * 1.05